@@ -3,11 +3,18 @@ import os
 import sys
 import json
 import argparse
+import hashlib
 import re
 import subprocess
 import tempfile
 import shutil
-from typing import List, Dict, Any
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from io import StringIO
+from types import SimpleNamespace
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
 # Dependencies: gitpython, pygithub, hub01_client
@@ -18,6 +25,177 @@ except ImportError as e:
     print("Please install: pip install gitpython")
     exit(1)
 
+import publish
+
+
+# Maps characters that are invalid in POSIX/Windows file names to '_',
+# used to turn tag names into manifest directory names
+_FS_SAFE = str.maketrans('/\\:*?"<>| ', '__________')
+
+# Serializes per-tag output blocks so parallel workers don't interleave
+_output_lock = threading.Lock()
+
+# Per-thread git.Repo objects (see get_thread_repo)
+_thread_state = threading.local()
+
+# Per-version upload locks (see get_version_lock)
+_version_locks: Dict[str, threading.Lock] = {}
+_version_locks_guard = threading.Lock()
+
+
+class ThreadOutput:
+    """
+    Stream proxy that routes writes to a per-thread buffer when one is set.
+    
+    Installed as sys.stdout/sys.stderr so the output printed by publish.py
+    functions running in worker threads can be collected per tag.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    @property
+    def buffer(self) -> Optional[StringIO]:
+        return getattr(self._local, 'buffer', None)
+    
+    @buffer.setter
+    def buffer(self, value: Optional[StringIO]):
+        self._local.buffer = value
+    
+    def write(self, data: str) -> int:
+        return (self.buffer or self._stream).write(data)
+    
+    def flush(self):
+        if self.buffer is None:
+            self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def get_thread_repo(repo: git.Repo) -> git.Repo:
+    """
+    Get a git.Repo for the current thread.
+    
+    GitPython reads objects through a persistent `git cat-file` process per
+    Repo, which must not be shared between threads, so each worker opens its
+    own Repo on the same repository.
+    
+    Args:
+        repo: Repo opened by the main thread
+        
+    Returns:
+        Repo object owned by the current thread
+    """
+    if getattr(_thread_state, 'repo', None) is None:
+        _thread_state.repo = git.Repo(repo.git_dir)
+    return _thread_state.repo
+
+
+def get_version_lock(version: str) -> threading.Lock:
+    """
+    Get the lock serializing uploads of one version.
+    
+    Several tags can resolve to the same version (same commit, or an
+    unchanged modinfo.json). Their exists-check and create must not run
+    concurrently: the first upload creates the version and the next ones
+    see it exists (skip, or overwrite with --overwrite).
+    
+    Args:
+        version: Version string from the manifest
+        
+    Returns:
+        Lock shared by all uploads of that version
+    """
+    with _version_locks_guard:
+        return _version_locks.setdefault(version, threading.Lock())
+
+
+@contextmanager
+def captured_output():
+    """
+    Collect everything the current thread prints and flush it as one block.
+    """
+    out, err = StringIO(), StringIO()
+    proxies = [(stream, buf) for stream, buf in ((sys.stdout, out), (sys.stderr, err))
+               if isinstance(stream, ThreadOutput)]
+    for stream, buf in proxies:
+        stream.buffer = buf
+    try:
+        yield
+    finally:
+        for stream, _ in proxies:
+            stream.buffer = None
+        flush_output(out, err)
+
+
+def is_remote(path_or_url: str) -> bool:
+    """
+    Check whether the input is a remote URL rather than a local path.
+    """
+    return path_or_url.startswith(('http://', 'https://', 'git@', 'ssh://'))
+
+
+def tag_dir_name(tag_name: str) -> str:
+    """
+    Directory name for a tag's manifest.
+    
+    Tag names that contain characters not allowed in file names are
+    sanitized and suffixed with a short hash of the original name, so that
+    e.g. 'x/1' and 'x_1' never share a directory.
+    
+    Args:
+        tag_name: Name of the tag
+        
+    Returns:
+        File-system safe directory name, unique per tag name
+    """
+    safe_name = tag_name.translate(_FS_SAFE)
+    if safe_name == tag_name:
+        return tag_name
+    digest = hashlib.sha1(tag_name.encode('utf-8')).hexdigest()[:8]
+    return f"{safe_name}-{digest}"
+
+
+def get_jobs(args, count: int) -> int:
+    """
+    Number of worker threads to use for `count` independent tasks.
+    
+    Args:
+        args: Command line arguments
+        count: Number of tasks to process
+        
+    Returns:
+        Worker count, honouring --jobs when given (default: min(8, count))
+    """
+    return args.jobs or max(1, min(8, count))
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for options that need an integer >= 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def flush_output(out: StringIO, err: StringIO):
+    """
+    Print a task's buffered stdout/stderr as a single block.
+    """
+    with _output_lock:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        if err.getvalue():
+            sys.stderr.write(err.getvalue())
+            sys.stderr.flush()
+
 
 def get_matching_tags(repo: git.Repo, pattern: str) -> List[git.TagReference]:
     """
@@ -44,12 +222,43 @@ def get_matching_tags(repo: git.Repo, pattern: str) -> List[git.TagReference]:
     return matching_tags
 
 
-def confirm_tags(tags: List[git.TagReference]) -> bool:
+def ask_confirmation(prompt: str, assume_yes: bool = False) -> bool:
+    """
+    Ask a yes/no question on stdin.
+    
+    Args:
+        prompt: Question to display
+        assume_yes: Answer yes without prompting (--yes)
+        
+    Returns:
+        True if user confirms, False otherwise (including end of input)
+    """
+    if assume_yes:
+        print(f"{prompt} [y/N]: y (--yes)")
+        return True
+    
+    while True:
+        try:
+            response = input(f"{prompt} [y/N]: ").strip().lower()
+        except EOFError:
+            # No more input (e.g. stdin is not a terminal): never assume yes
+            print()
+            return False
+        if response in ['y', 'yes']:
+            return True
+        elif response in ['n', 'no', '']:
+            return False
+        else:
+            print("Please enter 'y' or 'n'")
+
+
+def confirm_tags(tags: List[git.TagReference], assume_yes: bool = False) -> bool:
     """
     Display tags and ask for user confirmation.
     
     Args:
         tags: List of tag objects
+        assume_yes: Skip the prompt and confirm (--yes)
         
     Returns:
         True if user confirms, False otherwise
@@ -64,90 +273,193 @@ def confirm_tags(tags: List[git.TagReference]) -> bool:
         print(f"{i:3}. {tag.name}")
     print("-" * 60)
     
-    while True:
-        response = input(f"\nProceed with publishing these {len(tags)} tag(s)? [y/N]: ").strip().lower()
-        if response in ['y', 'yes']:
-            return True
-        elif response in ['n', 'no', '']:
-            return False
-        else:
-            print("Please enter 'y' or 'n'")
+    return ask_confirmation(f"\nProceed with publishing these {len(tags)} tag(s)?", assume_yes)
 
 
-def generate_manifests(args, tags: List[git.TagReference], manifest_dir: str) -> Dict[str, str]:
+def _generate_manifest(args, repo: git.Repo, repo_root: str, tag_index: Dict[str, List[git.TagReference]],
+                       tag_name: str, manifest_dir: str, show_manifest: bool = False) -> Optional[str]:
     """
-    Generate manifests for all tags using publish.py script.
+    Generate the manifest for a single tag using publish.create_manifest.
     
     Args:
         args: Command line arguments
-        tags: List of tag objects
+        repo: GitPython Repo object
+        repo_root: Root directory of the repository
+        tag_index: Commit hexsha to tags map (see publish.build_tag_index)
+        tag_name: Name of the tag to process
         manifest_dir: Directory to store manifests
+        show_manifest: Also print the manifest contents in the tag's output
         
     Returns:
-        Dictionary mapping tag names to manifest file paths
+        Path to the generated manifest, or None on failure
     """
-    manifests = {}
-    publish_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'publish.py')
-    
-    if not os.path.exists(publish_script):
-        print(f"Error: publish.py not found at {publish_script}")
-        return manifests
-    
-    print(f"\nGenerating manifests in {manifest_dir}...")
-    print("=" * 60)
-    
-    for tag in tags:
-        tag_name = tag.name
+    with captured_output():
         print(f"\nProcessing tag: {tag_name}")
         
         # Create subfolder for this tag's manifest
-        tag_manifest_dir = os.path.join(manifest_dir, tag_name.replace('/', '_'))
+        tag_manifest_dir = os.path.join(manifest_dir, tag_dir_name(tag_name))
         os.makedirs(tag_manifest_dir, exist_ok=True)
         manifest_path = os.path.join(tag_manifest_dir, 'manifest.json')
         
-        # Build command to call publish.py
-        cmd = [
-            sys.executable,
-            publish_script,
-            args.input,
-            '--mode', 'manifest',
-            '--tag', tag_name,
-            '--subfolder', args.subfolder,
-            '--release-type', args.release_type,
-            '--manifest-path', manifest_path
-        ]
-        
-        # Add optional arguments
-        if args.tags:
-            cmd.extend(['--tags', args.tags])
-        if args.github_token:
-            cmd.extend(['--github-token', args.github_token])
+        publish_args = SimpleNamespace(
+            **vars(args),
+            mode='manifest',
+            commit=None,
+            tag=tag_name,
+            manifest_path=manifest_path
+        )
         
-        # Execute
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            print(result.stdout)
-            if result.stderr:
-                print(result.stderr, file=sys.stderr)
-            manifests[tag_name] = manifest_path
-        except subprocess.CalledProcessError as e:
-            print(f"Error generating manifest for {tag_name}:")
-            print(e.stdout)
-            print(e.stderr, file=sys.stderr)
+            publish.create_manifest(publish_args, get_thread_repo(repo), repo_root, tag_index)
+            if show_manifest:
+                with open(manifest_path, 'r') as f:
+                    print(f.read())
+            return manifest_path
+        except Exception as e:
+            print(f"Error generating manifest for {tag_name}: {e}")
+            traceback.print_exc()
             print(f"Skipping tag {tag_name}")
+            return None
+
+
+def generate_manifests(args, repo: git.Repo, repo_root: str, tag_index: Dict[str, List[git.TagReference]],
+                       tags: List[git.TagReference], manifest_dir: str) -> Dict[str, str]:
+    """
+    Generate manifests for all tags using publish.py functions.
+    
+    Args:
+        args: Command line arguments
+        repo: GitPython Repo object
+        repo_root: Root directory of the repository
+        tag_index: Commit hexsha to tags map (see publish.build_tag_index)
+        tags: List of tag objects
+        manifest_dir: Directory to store manifests
+        
+    Returns:
+        Dictionary mapping tag names to manifest file paths
+    """
+    manifests = {}
+    
+    print(f"\nGenerating manifests in {manifest_dir}...")
+    print("=" * 60)
+    
+    with ThreadPoolExecutor(max_workers=get_jobs(args, len(tags))) as executor:
+        futures = {
+            executor.submit(_generate_manifest, args, repo, repo_root, tag_index, tag.name, manifest_dir): tag.name
+            for tag in tags
+        }
+        for future in as_completed(futures):
+            tag_name = futures[future]
+            manifest_path = future.result()
+            if manifest_path:
+                manifests[tag_name] = manifest_path
+    
+    # Keep the original tag order for review and upload
+    manifests = {tag.name: manifests[tag.name] for tag in tags if tag.name in manifests}
     
     print("=" * 60)
     print(f"Generated {len(manifests)} manifest(s)")
     return manifests
 
 
-def display_manifests_for_review(manifests: Dict[str, str]) -> bool:
+def iter_manifest_review(manifests: Dict[str, str]) -> Iterator[str]:
     """
-    Display manifests for user review using pydoc pager or fallback.
+    Yield the review text one manifest at a time.
+    
+    Manifest files are streamed as written, without re-parsing them.
     
     Args:
         manifests: Dictionary mapping tag names to manifest paths
         
+    Yields:
+        Chunks of review text
+    """
+    yield "=" * 70 + "\n"
+    yield "MANIFEST REVIEW\n"
+    yield "=" * 70 + "\n"
+    
+    for tag_name, manifest_path in manifests.items():
+        yield f"\n{'─' * 70}\n"
+        yield f"Tag: {tag_name}\n"
+        yield f"File: {manifest_path}\n"
+        yield f"{'─' * 70}\n\n"
+        
+        try:
+            with open(manifest_path, 'r') as f:
+                yield f.read()
+            yield "\n"
+        except OSError as e:
+            yield f"Error reading manifest: {e}\n"
+    
+    yield "\n" + "=" * 70 + "\n"
+    yield f"Total manifests: {len(manifests)}\n"
+    yield "=" * 70 + "\n"
+
+
+def get_pager_command() -> Optional[str]:
+    """
+    Pick the pager command the same way pydoc.pager does.
+    
+    Returns:
+        $MANPAGER or $PAGER if set, otherwise `more` on Windows and `less -R`
+        (falling back to `more`) elsewhere; None if no pager is available
+    """
+    pager = os.environ.get('MANPAGER') or os.environ.get('PAGER')
+    if pager:
+        return pager
+    
+    candidates = ['more'] if os.name == 'nt' else ['less -R', 'more']
+    for command in candidates:
+        if shutil.which(command.split()[0]):
+            return command
+    return None
+
+
+def page_output(chunks: Iterable[str], use_pager: bool = True):
+    """
+    Show text through a pager (see get_pager_command) when stdout is a
+    terminal, otherwise write it straight to stdout. Chunks are written as
+    they are produced, so the full text is never held in memory.
+    
+    Args:
+        chunks: Text chunks to display
+        use_pager: Set to False to always write to stdout
+    """
+    pager = get_pager_command() if use_pager and sys.stdout.isatty() else None
+    if not pager:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.flush()
+        return
+    
+    # Same handling as pydoc.pipepager: characters the console encoding
+    # can't represent are escaped, and Ctrl-C is left to the pager
+    proc = subprocess.Popen(pager, shell=True, stdin=subprocess.PIPE, errors='backslashreplace')
+    try:
+        with proc.stdin as pipe:
+            try:
+                for chunk in chunks:
+                    pipe.write(chunk)
+            except KeyboardInterrupt:
+                pass
+    except OSError:
+        pass  # Pager was closed before the end
+    while True:
+        try:
+            proc.wait()
+            break
+        except KeyboardInterrupt:
+            pass
+
+
+def display_manifests_for_review(manifests: Dict[str, str], assume_yes: bool = False) -> bool:
+    """
+    Display manifests for user review and ask for confirmation.
+    
+    Args:
+        manifests: Dictionary mapping tag names to manifest paths
+        assume_yes: Skip the prompt and confirm (--yes)
+        
     Returns:
         True if user confirms, False otherwise
     """
@@ -155,121 +467,155 @@ def display_manifests_for_review(manifests: Dict[str, str]) -> bool:
         print("No manifests to review.")
         return False
     
-    # Try to use pydoc pager
-    try:
-        import pydoc
-        
-        # Build content to display
-        content = []
-        content.append("=" * 70)
-        content.append("MANIFEST REVIEW")
-        content.append("=" * 70)
-        content.append("")
-        
-        for tag_name, manifest_path in manifests.items():
-            content.append(f"\n{'─' * 70}")
-            content.append(f"Tag: {tag_name}")
-            content.append(f"File: {manifest_path}")
-            content.append(f"{'─' * 70}\n")
-            
-            try:
-                with open(manifest_path, 'r') as f:
-                    manifest_data = json.load(f)
-                    content.append(json.dumps(manifest_data, indent=2))
-            except Exception as e:
-                content.append(f"Error reading manifest: {e}")
-        
-        content.append("\n" + "=" * 70)
-        content.append(f"Total manifests: {len(manifests)}")
-        content.append("=" * 70)
-        
-        # Display with pager
-        pydoc.pager('\n'.join(content))
+    # With --yes nobody is going to scroll, so don't hold the terminal in a pager
+    page_output(iter_manifest_review(manifests), use_pager=not assume_yes)
+    
+    return ask_confirmation(f"\nProceed with uploading {len(manifests)} version(s)?", assume_yes)
+
+
+def _upload_manifest(args, repo: git.Repo, client: publish.HubClient, repo_root: str, tag_name: str, manifest_path: str) -> bool:
+    """
+    Upload a single manifest using publish.pack_and_upload.
+    
+    Args:
+        args: Command line arguments
+        repo: GitPython Repo object
+        client: HubClient shared by all uploads (see publish.create_client)
+        repo_root: Root directory of the repository
+        tag_name: Name of the tag being uploaded
+        manifest_path: Path to the tag's manifest
         
-    except ImportError:
-        # Fallback: print to console
-        print("\n" + "=" * 70)
-        print("MANIFEST REVIEW (pydoc not available)")
-        print("=" * 70)
+    Returns:
+        True if the upload succeeded, False otherwise
+    """
+    with captured_output():
+        print(f"\nUploading tag: {tag_name}")
         
-        for tag_name, manifest_path in manifests.items():
-            print(f"\nTag: {tag_name}")
-            print(f"Manifest file: {manifest_path}")
-            print("Please review the manifest files in the directory.")
+        publish_args = SimpleNamespace(
+            **vars(args),
+            mode='upload',
+            manifest_path=manifest_path
+        )
         
-        print("\n" + "=" * 70)
-        print(f"Total manifests: {len(manifests)}")
-        print(f"Review directory: {os.path.dirname(list(manifests.values())[0]) if manifests else 'N/A'}")
-        print("=" * 70)
-    
-    # Ask for confirmation
-    while True:
-        response = input(f"\nProceed with uploading {len(manifests)} version(s)? [y/N]: ").strip().lower()
-        if response in ['y', 'yes']:
-            return True
-        elif response in ['n', 'no', '']:
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            
+            project_dir = os.path.join(repo_root, manifest.get('subfolder', args.subfolder))
+            with get_version_lock(manifest['version']):
+                return publish.pack_and_upload(publish_args, manifest, project_dir, get_thread_repo(repo), client)
+        except Exception as e:
+            print(f"Error uploading {tag_name}: {e}")
+            traceback.print_exc()
             return False
-        else:
-            print("Please enter 'y' or 'n'")
 
 
-def upload_manifests(args, manifests: Dict[str, str], repo_root: str):
+def upload_manifests(args, repo: git.Repo, manifests: Dict[str, str], repo_root: str):
     """
-    Upload all manifests using publish.py script.
+    Upload all manifests using publish.py functions.
     
     Args:
         args: Command line arguments
+        repo: GitPython Repo object
         manifests: Dictionary mapping tag names to manifest paths
         repo_root: Root directory of the repository
     """
-    publish_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'publish.py')
-    
     print(f"\nUploading {len(manifests)} version(s)...")
     print("=" * 60)
     
     success_count = 0
     failed_tags = []
+    jobs = get_jobs(args, len(manifests))
+    client = publish.create_client(args.api_url, args.api_token, jobs)
     
-    for tag_name, manifest_path in manifests.items():
-        print(f"\nUploading tag: {tag_name}")
-        
-        # Build command to call publish.py
-        cmd = [
-            sys.executable,
-            publish_script,
-            args.input,
-            '--mode', 'upload',
-            '--subfolder', args.subfolder,
-            '--manifest-path', manifest_path,
-            '--project-slug', args.project_slug,
-            '--api-url', args.api_url,
-            '--api-token', args.api_token
-        ]
-        
-        if args.overwrite:
-            cmd.append('--overwrite')
-        
-        # Execute
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            print(result.stdout)
-            if result.stderr:
-                print(result.stderr, file=sys.stderr)
-            success_count += 1
-        except subprocess.CalledProcessError as e:
-            print(f"Error uploading {tag_name}:")
-            print(e.stdout)
-            print(e.stderr, file=sys.stderr)
-            failed_tags.append(tag_name)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_upload_manifest, args, repo, client, repo_root, tag_name, manifest_path): tag_name
+            for tag_name, manifest_path in manifests.items()
+        }
+        for future in as_completed(futures):
+            if future.result():
+                success_count += 1
+            else:
+                failed_tags.append(futures[future])
     
     print("=" * 60)
+    print_upload_summary(len(manifests), success_count, failed_tags)
+
+
+def print_upload_summary(total: int, success_count: int, failed_tags: List[str]):
+    """
+    Print the final upload summary.
+    
+    Args:
+        total: Number of versions that were uploaded
+        success_count: Number of successful uploads
+        failed_tags: Names of the tags that failed to upload
+    """
     print(f"\nUpload Summary:")
-    print(f"  Successful: {success_count}/{len(manifests)}")
+    print(f"  Successful: {success_count}/{total}")
     if failed_tags:
         print(f"  Failed tags: {', '.join(failed_tags)}")
     print("\nMass publish complete!")
 
 
+def publish_pipelined(args, repo: git.Repo, repo_root: str, tag_index: Dict[str, List[git.TagReference]],
+                      tags: List[git.TagReference], manifest_dir: str) -> Dict[str, str]:
+    """
+    Generate and upload manifests as a pipeline: each manifest is handed to
+    the upload workers as soon as it is generated, so generation of the next
+    tags overlaps with uploads. Used with --yes, where there is no review
+    step between the two phases; each manifest is printed in its tag's
+    output instead, so the log still records what was published.
+    
+    Args:
+        args: Command line arguments
+        repo: GitPython Repo object
+        repo_root: Root directory of the repository
+        tag_index: Commit hexsha to tags map (see publish.build_tag_index)
+        tags: List of tag objects
+        manifest_dir: Directory to store manifests
+        
+    Returns:
+        Dictionary mapping tag names to generated manifest file paths
+    """
+    manifests = {}
+    success_count = 0
+    failed_tags = []
+    jobs = get_jobs(args, len(tags))
+    client = publish.create_client(args.api_url, args.api_token, jobs)
+    
+    print(f"\nGenerating and uploading {len(tags)} version(s), manifests in {manifest_dir}...")
+    print("=" * 60)
+    
+    with ThreadPoolExecutor(max_workers=jobs) as generate_executor, \
+            ThreadPoolExecutor(max_workers=jobs) as upload_executor:
+        generate_futures = {
+            generate_executor.submit(_generate_manifest, args, repo, repo_root, tag_index, tag.name, manifest_dir, True): tag.name
+            for tag in tags
+        }
+        upload_futures = {}
+        for future in as_completed(generate_futures):
+            tag_name = generate_futures[future]
+            manifest_path = future.result()
+            if manifest_path:
+                manifests[tag_name] = manifest_path
+                upload_future = upload_executor.submit(_upload_manifest, args, repo, client, repo_root, tag_name, manifest_path)
+                upload_futures[upload_future] = tag_name
+        
+        for future in as_completed(upload_futures):
+            if future.result():
+                success_count += 1
+            else:
+                failed_tags.append(upload_futures[future])
+    
+    print("=" * 60)
+    print(f"Generated {len(manifests)} manifest(s)")
+    if manifests:
+        print_upload_summary(len(manifests), success_count, failed_tags)
+    return manifests
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Mass Publishing Tool for Hub01 - Publish multiple Git tags at once",
@@ -312,9 +658,24 @@ Example:
     parser.add_argument('--api-token', default=os.environ.get('HUB01_API_TOKEN'), help='Hub01 API Token (can also use HUB01_API_TOKEN env var)')
     parser.add_argument('--overwrite', action='store_true', 
                         help='Overwrite existing versions')
+    parser.add_argument('--compress-level', type=int, default=1, choices=range(10), metavar='{0-9}',
+                        help='Zip compression level (default: 1)')
+    parser.add_argument('--no-compress', action='store_true',
+                        help='Store files in the zip without compression')
+    
+    parser.add_argument('-y', '--yes', '--no-prompt', dest='yes', action='store_true',
+                        help='Do not ask for confirmation (for CI / non-interactive use)')
+    
+    # Performance args
+    parser.add_argument('--jobs', type=positive_int, 
+                        help='Number of tags to process in parallel (default: min(8, number of tags))')
     
     args = parser.parse_args()
     
+    # Route prints from worker threads into per-tag buffers
+    sys.stdout = ThreadOutput(sys.stdout)
+    sys.stderr = ThreadOutput(sys.stderr)
+    
     # Setup temp directory for manifests if not specified
     temp_dir = None
     if args.manifest_dir:
@@ -327,11 +688,11 @@ Example:
     try:
         # Step 1: Setup repository
         print("Setting up repository...")
-        if args.input.startswith(('http://', 'https://', 'git@', 'ssh://')):
+        if is_remote(args.input):
             # Clone to temp
             clone_dir = tempfile.mkdtemp(prefix='mass_publish_repo_')
             print(f"Cloning {args.input}...")
-            repo = git.Repo.clone_from(args.input, clone_dir)
+            repo = git.Repo.clone_from(args.input, clone_dir, multi_options=publish.CLONE_OPTIONS)
             repo_root = clone_dir
         else:
             # Use local path
@@ -342,6 +703,7 @@ Example:
             
             try:
                 repo = git.Repo(repo_root, search_parent_directories=True)
+                repo_root = repo.working_dir
             except git.InvalidGitRepositoryError:
                 print(f"Error: Not a git repository: {repo_root}")
                 return 1
@@ -351,30 +713,38 @@ Example:
         matching_tags = get_matching_tags(repo, args.pattern)
         
         # Step 3: User confirmation for tags
-        if not confirm_tags(matching_tags):
+        if not confirm_tags(matching_tags, args.yes):
             print("Aborted by user.")
             return 0
         
+        tag_index = publish.build_tag_index(repo)
+        
+        # With --yes there is nothing to review: generate and upload in one pipeline
+        if args.yes:
+            if not publish_pipelined(args, repo, repo_root, tag_index, matching_tags, manifest_dir):
+                print("No manifests were generated. Aborting.")
+                return 1
+            return 0
+        
         # Step 4: Generate manifests
-        manifests = generate_manifests(args, matching_tags, manifest_dir)
+        manifests = generate_manifests(args, repo, repo_root, tag_index, matching_tags, manifest_dir)
         
         if not manifests:
             print("No manifests were generated. Aborting.")
             return 1
         
         # Step 5: Display manifests for review
-        if not display_manifests_for_review(manifests):
+        if not display_manifests_for_review(manifests, args.yes):
             print("Aborted by user.")
             return 0
         
         # Step 6: Upload all manifests
-        upload_manifests(args, manifests, repo_root)
+        upload_manifests(args, repo, manifests, repo_root)
         
         return 0
         
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
         return 1
     finally:
@@ -384,7 +754,7 @@ Example:
             shutil.rmtree(temp_dir)
         
         # Cleanup cloned repo if applicable
-        if args.input.startswith(('http://', 'https://', 'git@', 'ssh://')):
+        if is_remote(args.input):
             if 'clone_dir' in locals() and os.path.exists(clone_dir):
                 print(f"Cleaning up cloned repository: {clone_dir}")
                 shutil.rmtree(clone_dir)
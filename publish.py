@@ -2,11 +2,15 @@
 import os
 import json
 import argparse
+import functools
+import posixpath
 import re
 import shutil
+import tarfile
 import tempfile
+import time
 import zipfile
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Pattern, Tuple
 from datetime import datetime
 
 # Dependencies: gitpython, pygithub, hub01_client
@@ -15,6 +19,8 @@ try:
     from github import Github, GithubException
     from hub01_client.client import HubClient
     from hub01_client.exceptions import HubAPIException
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError as e:
     print(f"Error: Missing dependency: {e}")
     print("Please install: pip install gitpython PyGithub")
@@ -23,11 +29,40 @@ except ImportError as e:
         print("Please ensure hub01_client is installed.")
     exit(1)
 
+# Optional: requests_toolbelt streams the upload body from disk
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Valid Hub01 version string
+_VERSION_RE = re.compile(r'^[a-zA-Z0-9_.+-]+$')
+# Characters not allowed in a version string
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9_.+-]')
+# owner/repo from https://github.com/owner/repo.git, git@github.com:owner/repo.git, etc.
+_GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/.]+)')
+
+class _ZipNameTable(dict):
+    """
+    str.translate table that keeps letters, digits and ' ._-' and deletes the rest.
+    Filled lazily, so any Unicode letter is handled like str.isalpha() does.
+    """
+    def __missing__(self, code: int) -> Optional[int]:
+        c = chr(code)
+        self[code] = code if c.isalpha() or c.isdigit() or c in ' ._-' else None
+        return self[code]
+
+_ZIP_NAME_TABLE = _ZipNameTable()
+
+# Clone remote inputs without a working tree and without file contents:
+# blobs are fetched lazily (and batched by git archive) only for what is read
+CLONE_OPTIONS = ['--bare', '--filter=blob:none']
+
 def sanitize_version(version: str) -> str:
     """
     Sanitizes a version string to be valid for Hub01 Shop.
     """
-    return re.sub(r'[^a-zA-Z0-9_.+-]', '-', version)
+    return _SANITIZE_RE.sub('-', version)
 
 def setup_repo(path_or_url: str, temp_dir: Optional[str] = None) -> Tuple[git.Repo, str]:
     """
@@ -40,7 +75,7 @@ def setup_repo(path_or_url: str, temp_dir: Optional[str] = None) -> Tuple[git.Re
         if not temp_dir:
             raise ValueError("Temp directory required for cloning")
         print(f"Cloning {path_or_url} to {temp_dir}...")
-        repo = git.Repo.clone_from(path_or_url, temp_dir)
+        repo = git.Repo.clone_from(path_or_url, temp_dir, multi_options=CLONE_OPTIONS)
         return repo, temp_dir
     else:
         path = os.path.abspath(path_or_url)
@@ -53,31 +88,58 @@ def setup_repo(path_or_url: str, temp_dir: Optional[str] = None) -> Tuple[git.Re
         except git.InvalidGitRepositoryError:
             raise ValueError(f"Not a git repository: {path}")
 
-def get_github_release_info(repo_url: str, token: Optional[str]) -> Optional[Dict[str, Any]]:
+def build_tag_index(repo: git.Repo) -> Dict[str, List[git.TagReference]]:
+    """
+    Maps commit hexsha -> tags pointing to that commit.
+    Build once and reuse it when resolving versions for many commits.
+    """
+    tag_index = {}
+    for tag in repo.tags:
+        try:
+            hexsha = tag.commit.hexsha
+        except ValueError:
+            # Tag points to a non-commit object
+            continue
+        tag_index.setdefault(hexsha, []).append(tag)
+    return tag_index
+
+@functools.lru_cache(maxsize=32)
+def _get_gh_repo(owner: str, repo_name: str, token: str):
+    """
+    GitHub repository object, fetched once per (owner, repo, token).
+    """
+    return Github(token).get_repo(f"{owner}/{repo_name}")
+
+@functools.lru_cache(maxsize=1024)
+def _get_gh_release(owner: str, repo_name: str, token: str, tag_name: Optional[str]) -> Dict[str, Any]:
+    """
+    Release info for tag_name (latest release if None), fetched once per tag.
+    """
+    gh_repo = _get_gh_repo(owner, repo_name, token)
+    release = gh_repo.get_release(tag_name) if tag_name else gh_repo.get_latest_release()
+    return {
+        'name': release.title, # PyGithub uses 'title' for name? release.title is typically the name
+        'body': release.body,
+        'tag_name': release.tag_name
+    }
+
+def get_github_release_info(repo_url: str, token: Optional[str], tag_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Attempts to fetch release info from GitHub using PyGithub.
+    Uses the release of tag_name when given, otherwise the latest release.
     """
     if not token:
         return None
 
-    # Extract info from URL
-    # Supports: https://github.com/owner/repo.git, git@github.com:owner/repo.git, etc.
-    # Simple regex to get owner/repo
-    match = re.search(r'github\.com[:/]([^/]+)/([^/.]+)', repo_url)
+    # Extract owner/repo from URL
+    match = _GITHUB_URL_RE.search(repo_url)
     if not match:
         return None
     
     owner, repo_name = match.groups()
     
     try:
-        g = Github(token)
-        gh_repo = g.get_repo(f"{owner}/{repo_name}")
-        release = gh_repo.get_latest_release()
-        return {
-            'name': release.title, # PyGithub uses 'title' for name? release.title is typically the name
-            'body': release.body,
-            'tag_name': release.tag_name
-        }
+        return _get_gh_release(owner, repo_name, token, tag_name)
     except GithubException as e:
         print(f"Warning: GitHub API error: {e}")
         return None
@@ -85,38 +147,43 @@ def get_github_release_info(repo_url: str, token: Optional[str]) -> Optional[Dic
          print(f"Warning: Failed to fetch GitHub release info: {e}")
          return None
 
-def extract_version(repo_root: str, subfolder: str, head_commit: git.Commit, version_regex: str = r'^[a-zA-Z0-9_.+-]+$') -> str:
+def tree_path(subfolder: str, *parts: str) -> str:
+    """
+    Converts a subfolder (plus optional child parts) to a path inside a git tree.
+    Returns '' for the repository root.
+    """
+    path = posixpath.normpath(posixpath.join(subfolder.replace(os.sep, '/'), *parts))
+    return '' if path == '.' else path
+
+def extract_version(subfolder: str, head_commit: git.Commit, version_regex: Pattern = _VERSION_RE,
+                    tag_index: Optional[Dict[str, List[git.TagReference]]] = None) -> str:
     """
     Determines version.
-    1. modinfo.json in subfolder
-    2. git tag on HEAD
+    1. modinfo.json in subfolder (read from the commit, not the working tree)
+    2. git tag on the commit
     3. commit date
     """
-    full_path = os.path.join(repo_root, subfolder)
-    
     # 1. modinfo.json
-    modinfo_path = os.path.join(full_path, 'modinfo.json')
-    if os.path.exists(modinfo_path):
-        try:
-            with open(modinfo_path, 'r') as f:
-                data = json.load(f)
-                if 'version' in data:
-                    raw_ver = str(data['version'])
-                    if re.match(version_regex, raw_ver):
-                        return raw_ver
-                    else:
-                        return sanitize_version(raw_ver)
-        except Exception:
-            pass
+    try:
+        blob = head_commit.tree / tree_path(subfolder, 'modinfo.json')
+        data = json.loads(blob.data_stream.read())
+        if 'version' in data:
+            raw_ver = str(data['version'])
+            if version_regex.match(raw_ver):
+                return raw_ver
+            else:
+                return sanitize_version(raw_ver)
+    except Exception:
+        pass
 
     # 2. Git tag
     # Check tags pointing to this commit
-    # repo.tags is list of tags. We need to check if any tag.commit == head_commit
-    # Efficient way:
-    tags = [tag for tag in head_commit.repo.tags if tag.commit == head_commit]
+    if tag_index is None:
+        tag_index = build_tag_index(head_commit.repo)
+    tags = tag_index.get(head_commit.hexsha, [])
     for tag in tags:
         name = tag.name.lstrip('v')
-        if re.match(version_regex, name):
+        if version_regex.match(name):
             return name
         else:
             return sanitize_version(name)
@@ -126,19 +193,34 @@ def extract_version(repo_root: str, subfolder: str, head_commit: git.Commit, ver
     dt = head_commit.committed_datetime
     return dt.strftime('%Y.%m.%d.%H%M')
 
-def create_manifest(args, repo: git.Repo, repo_root: str):
+def create_manifest(args, repo: git.Repo, repo_root: str,
+                    tag_index: Optional[Dict[str, List[git.TagReference]]] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Builds the manifest for the requested commit/tag and writes it to args.manifest_path.
+    tag_index (see build_tag_index) can be passed to avoid rescanning tags on every call.
+    Returns (manifest, output_path).
+    """
     print(f"Generating manifest...")
 
-    # Checkout specific commit or tag if requested
+    # Resolve the requested commit or tag; the working tree is left untouched
     if args.commit:
-        print(f"Checking out commit {args.commit}...")
-        repo.git.checkout(args.commit)
+        print(f"Using commit {args.commit}...")
+        head = repo.commit(args.commit)
     elif args.tag:
-        print(f"Checking out tag {args.tag}...")
-        repo.git.checkout(args.tag)
-    
-    # Get the commit object (HEAD after checkout)
-    head = repo.head.commit
+        print(f"Using tag {args.tag}...")
+        head = repo.commit(args.tag)
+    else:
+        head = repo.head.commit
+
+    # The subfolder must exist in the selected commit
+    path = tree_path(args.subfolder)
+    if path:
+        try:
+            is_dir = (head.tree / path).type == 'tree'
+        except KeyError:
+            is_dir = False
+        if not is_dir:
+            raise ValueError(f"Project directory not found: {args.subfolder} at {head.hexsha}")
     
     # Release Date = Commit Date
     release_date = head.committed_datetime.isoformat()
@@ -151,13 +233,13 @@ def create_manifest(args, repo: git.Repo, repo_root: str):
         pass
         
     # Version
-    version = extract_version(repo_root, args.subfolder, head)
+    version = extract_version(args.subfolder, head, tag_index=tag_index)
     print(f"Detected version: {version}")
 
     # GitHub Info
     github_release = None
     if remote_url and args.github_token:
-        github_release = get_github_release_info(remote_url, args.github_token)
+        github_release = get_github_release_info(remote_url, args.github_token, args.tag)
 
     # Manifest
     manifest = {
@@ -194,32 +276,166 @@ def create_manifest(args, repo: git.Repo, repo_root: str):
     print(f"Manifest written to {output_path}")
     return manifest, output_path
 
-def pack_and_upload(args, manifest, project_dir):
+def get_compress_level(args) -> int:
+    """
+    Zip compression level from --compress-level / --no-compress (0 = stored).
+    """
+    return 0 if args.no_compress else args.compress_level
+
+def archive_project(repo: git.Repo, commit: str, subfolder: str, zip_path: str, compress_level: int = 1):
+    """
+    Zips the tracked files of subfolder at commit using `git archive`.
+    Paths in the zip are relative to subfolder; manifest.json files are left out.
+    Entries are stamped with the commit's committer time, so archiving the same
+    commit twice gives the same bytes.
+    """
+    path = tree_path(subfolder)
+    tree_ish = f"{commit}:{path}" if path else commit
+    pathspec = ('--', '.', ':(exclude,glob)**/manifest.json')
+    committed_date = repo.commit(commit).committed_date
+    if repo.git.version_info >= (2, 42):
+        repo.git.archive('--format=zip', f'-{compress_level}', f'--mtime=@{committed_date}',
+                         '-o', zip_path, tree_ish, *pathspec)
+        return
+
+    # Older git has no --mtime and stamps tree archives with the current time,
+    # so rebuild the zip from a tar stream with the commit time instead.
+    date_time = time.localtime(committed_date)[:6]
+    compression = zipfile.ZIP_DEFLATED if compress_level else zipfile.ZIP_STORED
+    proc = repo.git.archive('--format=tar', tree_ish, *pathspec, as_process=True)
+    with tarfile.open(fileobj=proc.stdout, mode='r|') as tar, zipfile.ZipFile(zip_path, 'w') as zipf:
+        for member in tar:
+            if member.isdir():
+                info = zipfile.ZipInfo(member.name.rstrip('/') + '/', date_time)
+                info.external_attr = (0o40000 | member.mode) << 16 | 0x10
+                zipf.writestr(info, b'')
+            elif member.issym():
+                info = zipfile.ZipInfo(member.name, date_time)
+                info.external_attr = (0o120000 | member.mode) << 16
+                zipf.writestr(info, member.linkname)
+            elif member.isfile():
+                info = zipfile.ZipInfo(member.name, date_time)
+                info.external_attr = (0o100000 | member.mode) << 16
+                zipf.writestr(info, tar.extractfile(member).read(),
+                              compress_type=compression, compresslevel=compress_level or None)
+    proc.wait()
+
+def _iter_project_files(base: str, rel: str = ''):
+    """
+    Yields (absolute_path, relative_path) for the files under base, skipping
+    .git directories and manifest.json files. Relative paths are built while
+    recursing, and os.scandir entries reuse the type info from the directory
+    listing, so there is no per-file stat or relpath.
+    Like os.walk, symlinked directories are not followed.
+    """
+    with os.scandir(base) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == '.git':
+                    continue
+                yield from _iter_project_files(entry.path, rel + entry.name + '/')
+            elif entry.is_file():
+                if entry.name == 'manifest.json':
+                    continue
+                yield entry.path, rel + entry.name
+
+def zip_directory(project_dir: str, zip_path: str, compress_level: int = 1):
+    """
+    Zips the files of project_dir as they are on disk, skipping .git and manifest.json.
+    """
+    if compress_level == 0:
+        zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED)
+    else:
+        zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compress_level)
+    with zipf:
+        for abs_file, rel_path in _iter_project_files(project_dir):
+            zipf.write(abs_file, rel_path)
+
+def create_version(client: HubClient, slug: str, manifest: Dict[str, Any], zip_path: str, zip_name: str):
+    """
+    Creates the version on Hub01 with zip_path as its file, uploaded as zip_name.
+    With requests_toolbelt installed the multipart body is streamed from disk
+    instead of being built in memory by client.versions.create.
+    """
+    release_date = manifest.get('release_date', datetime.now().isoformat())
+    tags = manifest.get('tags', [])
+
+    with open(zip_path, 'rb') as f:
+        if MultipartEncoder is None:
+            client.versions.create(
+                slug=slug,
+                name=manifest['name'],
+                version=manifest['version'],
+                release_type=manifest['release_type'],
+                release_date=release_date,
+                files=[(zip_name, f)],
+                changelog=manifest['changelog'],
+                tags=tags
+            )
+            return
+
+        # Same form as client.versions.create: empty values are not sent
+        fields = [(k, v) for k, v in [
+            ('name', manifest['name']),
+            ('version', manifest['version']),
+            ('release_type', manifest['release_type']),
+            ('release_date', release_date),
+            ('changelog', manifest['changelog']),
+        ] if v]
+        fields.extend(('tags[]', tag) for tag in tags)
+        fields.append(('files[]', (zip_name, f, 'application/zip')))
+
+        encoder = MultipartEncoder(fields=fields)
+        # Goes through the client's request helper to keep its error handling
+        client.versions._request(
+            'POST', f'/v1/project/{slug}/versions',
+            data=encoder, headers={'Content-Type': encoder.content_type}
+        )
+
+def create_client(api_url: str, api_token: str, pool_size: int = 1) -> HubClient:
+    """
+    Creates a HubClient meant to be shared by all uploads of a run.
+    Its sessions keep up to pool_size connections alive (one per parallel
+    upload) and retry failed connections with backoff.
+    """
+    client = HubClient(api_url, api_token)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=3, backoff_factor=0.5))
+    # Each hub01_client sub-client has its own session; versions does the uploads
+    for session in (client.session, client.versions.session):
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return client
+
+def pack_and_upload(args, manifest, project_dir, repo: Optional[git.Repo] = None,
+                    client: Optional[HubClient] = None) -> bool:
+    """
+    Zips the project and uploads it as the version described by manifest.
+    With a repo, the manifest's commit is packed with `git archive`;
+    otherwise project_dir is zipped from disk.
+    Pass a client (see create_client) to reuse its connections across uploads.
+    Returns True if the version was uploaded or already exists, False otherwise.
+    """
     if not args.project_slug or not args.api_url or not args.api_token:
         print("Upload skipped: Missing required upload arguments (--project-slug, --api-url, --api-token)")
-        return
+        return False
 
-    client = HubClient(args.api_url, args.api_token)
+    if client is None:
+        client = create_client(args.api_url, args.api_token)
     
     print(f"Preparing upload for {args.project_slug} version {manifest['version']}...")
     
     # Zip
     zip_name = f"{manifest['name']}.zip"
-    zip_name = "".join([c for c in zip_name if c.isalpha() or c.isdigit() or c in (' ','.','_','-')]).rstrip()
-    zip_path = os.path.join(tempfile.gettempdir(), zip_name)
-    
-    print(f"Zipping {project_dir} to {zip_path}...")
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(project_dir):
-            if '.git' in dirs:
-                dirs.remove('.git')
-            for file in files:
-                if file == 'manifest.json': continue
-                abs_file = os.path.join(root, file)
-                rel_path = os.path.relpath(abs_file, project_dir)
-                zipf.write(abs_file, rel_path)
-
-    # Upload
+    zip_name = zip_name.translate(_ZIP_NAME_TABLE).rstrip()
+
+    # Unique temp file per call, so parallel uploads never collide. When
+    # archiving from git it lives in the git dir: same filesystem as the
+    # objects being packed, and outside the working tree.
+    zip_dir = repo.git_dir if repo is not None else None
+    with tempfile.NamedTemporaryFile(suffix='.zip', dir=zip_dir, delete=False) as tmp:
+        zip_path = tmp.name
+
     try:
         # Check exists
         try:
@@ -227,27 +443,29 @@ def pack_and_upload(args, manifest, project_dir):
              if existing:
                  if not args.overwrite:
                      print(f"Version {manifest['version']} exists. Skipping. (Use --overwrite to force)")
-                     return
+                     return True
                  print(f"Version {manifest['version']} exists. Overwriting...")
         except BaseException:
              pass # Not found
-             
-        with open(zip_path, 'rb') as f:
-            print("Uploading...")
-            client.versions.create(
-                slug=args.project_slug,
-                name=manifest['name'],
-                version=manifest['version'],
-                release_type=manifest['release_type'],
-                release_date=manifest.get('release_date', datetime.now().isoformat()),
-                files=[f], 
-                changelog=manifest['changelog'],
-                tags=manifest.get('tags', [])
-            )
-            print("Upload successful!")
+
+        if repo is not None and manifest.get('commit'):
+            subfolder = manifest.get('subfolder', args.subfolder)
+            print(f"Archiving {subfolder} at {manifest['commit']} to {zip_path}...")
+            archive_project(repo, manifest['commit'], subfolder, zip_path, get_compress_level(args))
+        else:
+            if not os.path.isdir(project_dir):
+                raise ValueError(f"Project directory not found: {project_dir}")
+            print(f"Zipping {project_dir} to {zip_path}...")
+            zip_directory(project_dir, zip_path, get_compress_level(args))
+
+        print("Uploading...")
+        create_version(client, args.project_slug, manifest, zip_path, zip_name)
+        print("Upload successful!")
+        return True
             
     except HubAPIException as e:
          print(f"Upload failed: {e}")
+         return False
     finally:
          if os.path.exists(zip_path):
              os.remove(zip_path)
@@ -261,8 +479,8 @@ def main():
     
     # Version selection (mutually exclusive)
     g = parser.add_mutually_exclusive_group()
-    g.add_argument('--commit', help='Commit hash to checkout')
-    g.add_argument('--tag', help='Tag to checkout')
+    g.add_argument('--commit', help='Commit hash to publish')
+    g.add_argument('--tag', help='Tag to publish')
     
     # Manifest args
     parser.add_argument('--release-type', default='release', choices=['release', 'beta', 'alpha'])
@@ -275,6 +493,8 @@ def main():
     parser.add_argument('--api-url', help='Hub01 API URL')
     parser.add_argument('--api-token', default=os.environ.get('HUB01_API_TOKEN'), help='Hub01 API Token (can also use HUB01_API_TOKEN env var)')
     parser.add_argument('--overwrite', action='store_true', help='Overwrite existing version')
+    parser.add_argument('--compress-level', type=int, default=1, choices=range(10), metavar='{0-9}', help='Zip compression level (default: 1)')
+    parser.add_argument('--no-compress', action='store_true', help='Store files in the zip without compression')
     
     # Mode
     parser.add_argument('--mode', choices=['manifest', 'upload', 'both'], default='both', help='Action to perform')
@@ -287,8 +507,6 @@ def main():
     try:
         repo, repo_root = setup_repo(args.input, temp_dir)
         project_dir = os.path.join(repo_root, args.subfolder)
-        if not os.path.exists(project_dir):
-             raise ValueError(f"Project directory not found: {project_dir}")
 
         manifest = None
         
@@ -315,13 +533,11 @@ def main():
                      if 'subfolder' in manifest:
                          print(f"Using subfolder from manifest: {manifest['subfolder']}")
                          project_dir = os.path.join(repo_root, manifest['subfolder'])
-                         if not os.path.exists(project_dir):
-                             raise ValueError(f"Project directory from manifest not found: {project_dir}")
                  else:
                      print(f"Error: manifest.json not found at {check_path}.")
                      return
             
-            pack_and_upload(args, manifest, project_dir)
+            pack_and_upload(args, manifest, project_dir, repo)
             
     except Exception as e:
         print(f"Error: {e}")